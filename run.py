@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 
@@ -6,7 +7,26 @@ SRC_DIR = os.path.join(CURRENT_DIR, "src")
 if SRC_DIR not in sys.path:
 	sys.path.insert(0, SRC_DIR)
 
-from cli.main import main
+from utils import profiling
+
+
+def _parse_args() -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="RevPick - Bike Suggestion System")
+	parser.add_argument(
+		"--profile",
+		nargs="?",
+		const="profiles",
+		metavar="DIR",
+		help="profile service and REST calls, writing reports to DIR (default: profiles)",
+	)
+	return parser.parse_args()
+
 
 if __name__ == "__main__":
+	args = _parse_args()
+	if args.profile:
+		print(f"Profiling enabled; reports in {profiling.enable(args.profile)}")
+	else:
+		profiling.enable_from_env()
+	from cli.main import main
 	main()
@@ -1,13 +1,16 @@
 from typing import Optional
 
+from services.inventory_service import InventoryService
 from services.product_service import ProductService
 from services.suggestion_service import SuggestionService
+from utils.facets import FACETS, value_sort_key
 from utils.helpers import prompt_float, prompt_int, prompt_str
 from config.supabase_config import get_client
 
 
 product_service = ProductService()
 suggestion_service = SuggestionService()
+inventory_service = InventoryService()
 
 
 def _format_table(headers, rows):
@@ -100,7 +103,6 @@ def add_update_bike() -> None:
 	name = prompt_str("Name:")
 	engine_cc = prompt_int("Engine CC:")
 	price = prompt_float("Price:")
-	stock = prompt_int("Stock:", 0)
 	brand = prompt_str("Brand:")
 	category_id = prompt_str("Category ID (UUID) [blank=none]:", None)
 	data = {
@@ -108,7 +110,6 @@ def add_update_bike() -> None:
 		"name": name,
 		"engine_cc": engine_cc,
 		"price": price,
-		"stock": stock,
 		"brand": brand,
 	}
 	# Clean empty string UUIDs which cause 400 errors
@@ -131,6 +132,93 @@ def add_update_bike() -> None:
 
 
 
+def search_bikes() -> None:
+	query = prompt_str("Search name/brand:", None)
+	if not query or not query.strip():
+		print("Enter part of a bike name or brand.")
+		return
+	bikes = product_service.search_bikes(query)
+	if not bikes:
+		print("No bikes matched your search.")
+		return
+	headers = ["#", "Name", "Brand", "CC", "Price(₹)", "Stock", "Product ID"]
+	rows = []
+	for idx, b in enumerate(bikes, start=1):
+		cc = b.get('engine_cc') if b.get('engine_cc') is not None else "-"
+		price = b.get('price') if b.get('price') is not None else "-"
+		stock = b.get('stock') if b.get('stock') is not None else "-"
+		rows.append([idx, b.get('name'), b.get('brand'), cc, price, stock, b.get('prod_id')])
+	_format_table(headers, rows)
+
+
+def _parse_facet_value(facet: str, value: str):
+	if facet == "is_electric":
+		return value.strip().lower() in ("true", "yes", "y", "1", "ev")
+	return value.strip()
+
+
+def browse_facets() -> None:
+	selection = {}
+	while True:
+		counts = product_service.facet_counts(selection)
+		print("\nCurrent filters:", ", ".join(f"{k}={v}" for k, v in selection.items()) or "none")
+		for facet in FACETS:
+			values = sorted(counts.get(facet, {}).items(), key=lambda kv: value_sort_key(kv[0]))
+			print(f"{facet}: " + ", ".join(f"{v} ({n})" for v, n in values))
+		choice = prompt_str("Filter as facet=value, 'clear', or blank to list bikes:", "")
+		if not choice or not choice.strip():
+			break
+		if choice.strip().lower() == "clear":
+			selection = {}
+			continue
+		if "=" not in choice:
+			print("Use facet=value, e.g. brand=Honda or price_band=100000-200000.")
+			continue
+		facet, value = (part.strip() for part in choice.split("=", 1))
+		if facet not in FACETS:
+			print(f"Unknown facet. Choose one of: {', '.join(FACETS)}")
+			continue
+		if value:
+			selection[facet] = _parse_facet_value(facet, value)
+		else:
+			selection.pop(facet, None)
+	bikes = product_service.facet_matches(selection)
+	if not bikes:
+		print("No bikes matched these filters.")
+		return
+	headers = ["#", "Name", "Brand", "CC", "Price(₹)", "Stock"]
+	rows = []
+	for idx, b in enumerate(bikes, start=1):
+		cc = b.get('engine_cc') if b.get('engine_cc') is not None else "-"
+		price = b.get('price') if b.get('price') is not None else "-"
+		stock = b.get('stock') if b.get('stock') is not None else "-"
+		rows.append([idx, b.get('name'), b.get('brand'), cc, price, stock])
+	_format_table(headers, rows)
+
+
+def update_store_stock() -> None:
+	city = prompt_str("City [blank=all]:", None)
+	stores = inventory_service.list_stores(city or None)
+	if not stores:
+		print("No stores found.")
+		return
+	headers = ["Store ID", "Name", "City", "Location"]
+	rows = [[s.get('store_id'), s.get('name'), s.get('city'), s.get('location') or "-"] for s in stores]
+	_format_table(headers, rows)
+	store_id = prompt_str("Store ID:")
+	prod_id = prompt_str("Product ID:")
+	stock = prompt_int("Stock at this store:", None)
+	if not store_id or not prod_id or stock is None or stock < 0:
+		print("Store ID, Product ID and a non-negative stock are required.")
+		return
+	result = inventory_service.set_store_stock(store_id.strip(), prod_id.strip(), stock)
+	if not result:
+		print("No changes made.")
+		return
+	print(f"Saved: store {result.get('store_id')} now has {result.get('stock')} of {result.get('prod_id')}")
+
+
+
 
 def main() -> None:
 	while True:
@@ -138,8 +226,11 @@ def main() -> None:
 		print("1. View Bike Suggestions (by CC, budget, location)")
 		print("2. Add/Update Bike (store manager)")
 		print("3. View Electric Bikes (by budget, brand)")
-		print("4. Exit")
-		choice = input("Choose an option (1-4): ")
+		print("4. Update Store Stock (store staff)")
+		print("5. Search Bikes (name/brand)")
+		print("6. Browse Bikes by Filters (with match counts)")
+		print("7. Exit")
+		choice = input("Choose an option (1-7): ")
 		if choice == "1":
 			view_bike_suggestions()
 		elif choice == "2":
@@ -147,10 +238,16 @@ def main() -> None:
 		elif choice == "3":
 			view_electric_bikes()
 		elif choice == "4":
+			update_store_stock()
+		elif choice == "5":
+			search_bikes()
+		elif choice == "6":
+			browse_facets()
+		elif choice == "7":
 			print("Goodbye!")
 			break
 		else:
-			print("Invalid option. Please choose 1-4.")
+			print("Invalid option. Please choose 1-7.")
 
 
 if __name__ == "__main__":
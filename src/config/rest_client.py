@@ -4,6 +4,8 @@ import urllib.request
 from urllib.error import HTTPError, URLError
 from typing import Any, Dict, List, Optional
 
+from utils.profiling import profiled, span
+
 
 class _Response:
 	def __init__(self, data: Optional[List[Dict[str, Any]]]) -> None:
@@ -18,6 +20,7 @@ class _Query:
 		self._select = "*"
 		self._filters: Dict[str, Any] = {}
 		self._limit: Optional[int] = None
+		self._order: Optional[str] = None
 		self._payload: Optional[Dict[str, Any]] = None
 		self._method: Optional[str] = None
 		self._on_conflict: Optional[str] = None
@@ -29,13 +32,21 @@ class _Query:
 		return self
 
 	def eq(self, key: str, value: Any) -> "_Query":
-		self._filters[key] = value
+		self._filters[key] = f"eq.{value}"
+		return self
+
+	def gt(self, key: str, value: Any) -> "_Query":
+		self._filters[key] = f"gt.{value}"
 		return self
 
 	def limit(self, n: int) -> "_Query":
 		self._limit = n
 		return self
 
+	def order(self, column: str, desc: bool = False) -> "_Query":
+		self._order = f"{column}.{'desc' if desc else 'asc'}"
+		return self
+
 	def insert(self, data: Dict[str, Any]) -> "_Query":
 		self._payload = data
 		self._method = "POST"
@@ -57,11 +68,14 @@ class _Query:
 		self._method = "DELETE"
 		return self
 
+	@profiled("_Query.execute")
 	def execute(self) -> _Response:
 		url = f"{self.base_url}/rest/v1/{urllib.parse.quote(self.table)}"
 		params: Dict[str, str] = {"select": self._select}
 		for k, v in self._filters.items():
-			params[k] = f"eq.{v}"
+			params[k] = v
+		if self._order is not None:
+			params["order"] = self._order
 		if self._limit is not None:
 			params["limit"] = str(self._limit)
 		if self._method in (None, "GET"):
@@ -69,9 +83,12 @@ class _Query:
 			headers = dict(self.headers)
 			headers["Accept"] = "application/json"
 			req = urllib.request.Request(full_url, headers=headers, method="GET")
-			with urllib.request.urlopen(req) as resp:
-				data = json.loads(resp.read().decode("utf-8"))
-				return _Response(data if isinstance(data, list) else [])
+			with span("network"):
+				with urllib.request.urlopen(req) as resp:
+					body = resp.read().decode("utf-8")
+			with span("decode"):
+				data = json.loads(body)
+			return _Response(data if isinstance(data, list) else [])
 		else:
 			headers = dict(self.headers)
 			headers["Content-Type"] = "application/json"
@@ -94,8 +111,10 @@ class _Query:
 			payload_bytes = json.dumps(payload_obj).encode("utf-8") if self._method in ("POST", "PATCH") else None
 			req = urllib.request.Request(full_url, data=payload_bytes, headers=headers, method=self._method)
 			try:
-				with urllib.request.urlopen(req) as resp:
-					body = resp.read().decode("utf-8")
+				with span("network"):
+					with urllib.request.urlopen(req) as resp:
+						body = resp.read().decode("utf-8")
+				with span("decode"):
 					try:
 						data = json.loads(body)
 						return _Response(data if isinstance(data, list) else [])
@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+
+class CatalogChangeDAO:
+	TABLE = "catalog_changes"
+
+	def __init__(self, client) -> None:
+		self.client = client
+
+	def latest_version(self) -> int:
+		response = (
+			self.client.table(self.TABLE).select("version").order("version", desc=True).limit(1).execute()
+		)
+		return int(response.data[0]["version"]) if response.data else 0
+
+	def list_since(self, version: int, limit: int = 500) -> List[Dict[str, Any]]:
+		response = (
+			self.client.table(self.TABLE)
+			.select("*")
+			.gt("version", version)
+			.order("version")
+			.limit(limit)
+			.execute()
+		)
+		return response.data or []
@@ -0,0 +1,25 @@
+from typing import Any, Dict, List, Optional
+
+
+class StoreDAO:
+	TABLE = "stores"
+
+	def __init__(self, client) -> None:
+		self.client = client
+
+	def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+		response = self.client.table(self.TABLE).insert(data).execute()
+		return response.data[0] if response.data else {}
+
+	def get_by_id(self, store_id: str) -> Optional[Dict[str, Any]]:
+		response = (
+			self.client.table(self.TABLE).select("*").eq("store_id", store_id).limit(1).execute()
+		)
+		return response.data[0] if response.data else None
+
+	def list(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+		query = self.client.table(self.TABLE).select("*")
+		if filters:
+			for key, value in filters.items():
+				query = query.eq(key, value)
+		return query.execute().data or []
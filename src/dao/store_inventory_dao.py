@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Optional
+
+
+class StoreInventoryDAO:
+	TABLE = "store_inventory"
+
+	def __init__(self, client) -> None:
+		self.client = client
+
+	def upsert(self, store_id: str, prod_id: str, stock: int) -> Dict[str, Any]:
+		response = (
+			self.client.table(self.TABLE)
+			.upsert([{"store_id": store_id, "prod_id": prod_id, "stock": stock}], on_conflict="store_id,prod_id")
+			.execute()
+		)
+		return response.data[0] if response.data else {}
+
+	def list(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+		query = self.client.table(self.TABLE).select("store_id,prod_id,stock")
+		if filters:
+			for key, value in filters.items():
+				query = query.eq(key, value)
+		return query.execute().data or []
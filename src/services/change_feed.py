@@ -0,0 +1,118 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from config.supabase_config import get_client
+from dao.catalog_change_dao import CatalogChangeDAO
+
+Listener = Callable[[Dict[str, Any]], None]
+
+
+class ChangeFeed:
+	"""Polls catalog_changes and hands each new change to subscribed caches.
+
+	Versions come from a sequence, so a row can become visible after a higher
+	version has already been read (its transaction took the number first but
+	committed later). The cursor therefore only advances over contiguous
+	versions; a missing version is waited for until `gap_timeout` seconds have
+	passed, after which it is treated as a rolled-back or skipped number.
+	Changes above a gap are applied as soon as they are seen. Writes to the same
+	row serialize on its lock, so per-row changes always arrive in order.
+
+	A change that only becomes visible after its gap has timed out is never
+	applied: the cursor has already moved past it, so the affected cache
+	entries stay stale until that row is written again or the process
+	restarts. Keep `gap_timeout` well above the longest catalog write
+	transaction; cache staleness is otherwise bounded by the poll interval.
+
+	The first poll only records the starting version (a little behind the head
+	so in-flight transactions are replayed); nothing is fetched before a cache
+	actually needs the feed.
+
+	Polls are throttled to one every `min_interval` seconds, so services can
+	call poll() at the top of every read without adding a round trip per call.
+	"""
+
+	def __init__(
+		self,
+		dao: CatalogChangeDAO,
+		min_interval: float = 2.0,
+		batch_size: int = 500,
+		gap_timeout: float = 60.0,
+		replay_window: int = 200,
+	) -> None:
+		self.dao = dao
+		self.min_interval = min_interval
+		self.batch_size = batch_size
+		self.gap_timeout = gap_timeout
+		self.replay_window = replay_window
+		self.last_version: Optional[int] = None
+		self._last_poll = 0.0
+		self._listeners: List[Listener] = []
+		self._applied: Set[int] = set()
+		self._gaps: Dict[int, float] = {}
+		self._lock = threading.Lock()
+
+	def subscribe(self, listener: Listener) -> None:
+		with self._lock:
+			if listener not in self._listeners:
+				self._listeners.append(listener)
+
+	def poll(self, force: bool = False) -> int:
+		"""Apply changes not yet seen; return how many were applied."""
+		with self._lock:
+			now = time.monotonic()
+			if self.last_version is None:
+				# Start a little behind the head so changes from transactions still
+				# in flight at startup are replayed; patches are idempotent.
+				self.last_version = max(self.dao.latest_version() - self.replay_window, 0)
+				self._last_poll = now
+				return 0
+			if not force and now - self._last_poll < self.min_interval:
+				return 0
+			self._last_poll = now
+			applied = 0
+			cursor = self.last_version
+			while True:
+				changes = self.dao.list_since(cursor, self.batch_size)
+				for change in changes:
+					version = int(change["version"])
+					cursor = version
+					if version in self._applied:
+						continue
+					for listener in self._listeners:
+						listener(change)
+					self._applied.add(version)
+					applied += 1
+				if len(changes) < self.batch_size:
+					break
+			self._advance(now)
+			return applied
+
+	def _advance(self, now: float) -> None:
+		"""Move last_version over applied versions and gaps that have timed out."""
+		if not self._applied:
+			return
+		highest = max(self._applied)
+		version = self.last_version + 1
+		while version <= highest:
+			if version in self._applied:
+				self._applied.discard(version)
+				self._gaps.pop(version, None)
+			elif now - self._gaps.setdefault(version, now) >= self.gap_timeout:
+				del self._gaps[version]
+			else:
+				break
+			self.last_version = version
+			version += 1
+
+
+_cached_feed: Optional[ChangeFeed] = None
+
+
+def get_change_feed() -> ChangeFeed:
+	"""Return the process-wide change feed; its baseline is set by the first poll()."""
+	global _cached_feed
+	if _cached_feed is None:
+		_cached_feed = ChangeFeed(CatalogChangeDAO(get_client()))
+	return _cached_feed
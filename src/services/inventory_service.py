@@ -0,0 +1,63 @@
+from typing import Any, Dict, List, Mapping, Optional
+
+from config.supabase_config import get_client
+from dao.store_dao import StoreDAO
+from dao.store_inventory_dao import StoreInventoryDAO
+from services.change_feed import get_change_feed
+from utils.inventory_index import InventoryIndex
+
+# Shared across service instances so every caller sees the same stock view
+_cached_index: Optional[InventoryIndex] = None
+
+
+def _apply_change(change: Dict[str, Any]) -> None:
+	"""Patch the shared index from a catalog_changes row written by another process."""
+	if _cached_index is None:
+		return
+	table = change.get("table_name")
+	row = change.get("row_data") or {}
+	store_id = str(change.get("store_id"))
+	if table == "stores":
+		if change.get("op") == "DELETE":
+			_cached_index.remove_store(store_id)
+		else:
+			_cached_index.add_store(store_id, row.get("city"))
+	elif table == "store_inventory":
+		stock = row.get("stock") if change.get("op") != "DELETE" else 0
+		_cached_index.set_stock(store_id, str(change.get("prod_id")), int(stock) if stock is not None else 0)
+
+
+class InventoryService:
+	def __init__(self) -> None:
+		client = get_client()
+		self.store_dao = StoreDAO(client)
+		self.dao = StoreInventoryDAO(client)
+		self.feed = get_change_feed()
+		self.feed.subscribe(_apply_change)
+
+	def index(self) -> InventoryIndex:
+		global _cached_index
+		self.feed.poll()
+		if _cached_index is None:
+			_cached_index = InventoryIndex.build(self.store_dao.list(), self.dao.list())
+		return _cached_index
+
+	def stock_in_city(self, city: str) -> Mapping[str, int]:
+		return self.index().stock_in_city(city)
+
+	def list_stores(self, city: Optional[str] = None) -> List[Dict[str, Any]]:
+		stores = self.store_dao.list()
+		if city:
+			stores = [s for s in stores if str(s.get("city", "")).strip().lower() == city.strip().lower()]
+		return stores
+
+	def set_store_stock(self, store_id: str, prod_id: str, stock: int) -> Dict[str, Any]:
+		row = self.dao.upsert(store_id, prod_id, stock)
+		if row:
+			index = self.index()
+			if not index.has_store(store_id):
+				store = self.store_dao.get_by_id(store_id) or {}
+				index.add_store(store_id, store.get("city"))
+			saved = row.get("stock")
+			index.set_stock(str(row.get("store_id")), str(row.get("prod_id")), int(saved) if saved is not None else 0)
+		return row
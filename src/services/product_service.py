@@ -1,20 +1,63 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 from config.supabase_config import get_client
 from dao.product_dao import ProductDAO
+from services.change_feed import get_change_feed
+from services.inventory_service import InventoryService
+from utils.catalog_indexes import CatalogIndexes
+from utils.profiling import profiled
+
+# Catalog rows and the in-memory indexes over them, shared across instances
+_cached_indexes: Optional[CatalogIndexes] = None
+
+
+def _apply_change(change: Dict[str, Any]) -> None:
+	"""Patch the catalog indexes from a catalog_changes row written by another process."""
+	if _cached_indexes is not None:
+		_cached_indexes.apply_change(change)
 
 
 class ProductService:
 	def __init__(self) -> None:
 		self.dao = ProductDAO(get_client())
+		self.inventory = InventoryService()
+		self.feed = get_change_feed()
+		self.feed.subscribe(_apply_change)
 
+	@profiled("ProductService.add_or_update_bike")
 	def add_or_update_bike(self, data: Dict[str, Any]) -> Dict[str, Any]:
 		prod_id = data.get("prod_id")
 		if prod_id:
-			updated = self.dao.update(prod_id, data)
-			return updated or {}
-		return self.dao.create(data)
+			saved = self.dao.update(prod_id, data) or {}
+		else:
+			saved = self.dao.create(data)
+		if saved and _cached_indexes is not None:
+			_cached_indexes.index_product(saved)
+		return saved
+
+	@profiled("ProductService.search_bikes")
+	def search_bikes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+		"""Fuzzy name/brand lookup answered from the in-memory trigram index."""
+		return self._indexes().search(query, limit)
+
+	@profiled("ProductService.facet_counts")
+	def facet_counts(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[Any, int]]:
+		"""Per-value counts for brand, category_id, is_electric, price_band and cc_band under the given filters."""
+		return self._indexes().facet_counts(filters)
+
+	@profiled("ProductService.facet_matches")
+	def facet_matches(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+		bikes = self._indexes().facet_matches(filters)
+		return sorted(bikes, key=lambda b: (float(b.get("price") or 0), int(b.get("engine_cc") or 0)))
+
+	def _indexes(self) -> CatalogIndexes:
+		global _cached_indexes
+		self.feed.poll()
+		if _cached_indexes is None:
+			_cached_indexes = CatalogIndexes.build(self.dao.list())
+		return _cached_indexes
 
+	@profiled("ProductService.list_bikes")
 	def list_bikes(
 		self,
 		category_id: Optional[str] = None,
@@ -33,9 +76,20 @@ class ProductService:
 			filters["brand"] = brand
 		if is_electric is not None:
 			filters["is_electric"] = is_electric
+		# Location is answered from the in-memory inventory index, not a join
+		city_stock: Optional[Mapping[str, int]] = None
+		if location:
+			city_stock = self.inventory.stock_in_city(location)
+			if not city_stock:
+				return []
 		bikes = self.dao.list(filters if filters else None)
 		result: List[Dict[str, Any]] = []
 		for bike in bikes:
+			if city_stock is not None:
+				local_stock = city_stock.get(str(bike.get("prod_id")))
+				if not local_stock:
+					continue
+				bike = dict(bike, stock=local_stock)
 			price_value = bike.get("price")
 			price_number = float(price_value) if price_value is not None else 0.0
 			if min_price is not None and price_number < min_price:
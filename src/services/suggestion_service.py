@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional
 from config.supabase_config import get_client
 from dao.suggestion_dao import SuggestionDAO
 from services.product_service import ProductService
+from utils.profiling import profiled
 
 
 class SuggestionService:
@@ -11,6 +12,7 @@ class SuggestionService:
 		self.dao = SuggestionDAO(get_client())
 		self.product_service = ProductService()
 
+	@profiled("SuggestionService.suggest_bikes")
 	def suggest_bikes(
 		self,
 		cust_id: Optional[str] = None,
@@ -44,6 +46,7 @@ class SuggestionService:
 				)
 		return bikes
 
+	@profiled("SuggestionService.generate_report")
 	def generate_report(self) -> Dict[str, Any]:
 		client = get_client()
 		products_count = len(client.table("products").select("prod_id").execute().data or [])
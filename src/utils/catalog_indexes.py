@@ -0,0 +1,62 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.facets import FacetIndex
+from utils.trigram_index import TrigramIndex
+
+
+class CatalogIndexes:
+	"""Product rows plus the search and facet indexes over them, behind one lock.
+
+	Change-feed patches and reads may come from different threads (Streamlit
+	sessions share one instance), so every access goes through the lock.
+	"""
+
+	def __init__(self) -> None:
+		self._lock = threading.RLock()
+		self._catalog: Dict[str, Dict[str, Any]] = {}
+		self._search = TrigramIndex()
+		self._facets = FacetIndex()
+
+	@classmethod
+	def build(cls, products: Iterable[Dict[str, Any]]) -> "CatalogIndexes":
+		indexes = cls()
+		for product in products:
+			indexes.index_product(product)
+		return indexes
+
+	def index_product(self, bike: Dict[str, Any]) -> None:
+		if not bike.get("prod_id"):
+			return
+		prod_id = str(bike["prod_id"])
+		with self._lock:
+			self._catalog[prod_id] = bike
+			self._search.add(prod_id, bike.get("name"), bike.get("brand"))
+			self._facets.add(bike)
+
+	def unindex_product(self, prod_id: str) -> None:
+		with self._lock:
+			self._catalog.pop(prod_id, None)
+			self._search.remove(prod_id)
+			self._facets.remove(prod_id)
+
+	def apply_change(self, change: Dict[str, Any]) -> None:
+		"""Patch from a catalog_changes row; rows for other tables are ignored."""
+		if change.get("table_name") != "products":
+			return
+		if change.get("op") == "DELETE":
+			self.unindex_product(str(change.get("prod_id")))
+		else:
+			self.index_product(change.get("row_data") or {})
+
+	def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+		with self._lock:
+			return [self._catalog[prod_id] for prod_id, _ in self._search.search(query, limit) if prod_id in self._catalog]
+
+	def facet_counts(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[Any, int]]:
+		with self._lock:
+			return self._facets.counts(filters)
+
+	def facet_matches(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+		with self._lock:
+			return [self._catalog[prod_id] for prod_id in self._facets.match(filters) if prod_id in self._catalog]
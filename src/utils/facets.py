@@ -0,0 +1,171 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Upper bounds (exclusive) of each band; the last band is open-ended
+DEFAULT_PRICE_BOUNDS: Sequence[float] = (100000, 200000, 500000, 1000000, 2000000)
+DEFAULT_CC_BOUNDS: Sequence[float] = (125, 200, 400, 750, 1000)
+
+FACETS = ("brand", "category_id", "is_electric", "price_band", "cc_band")
+NO_VALUE = "n/a"
+
+
+def _fmt(bound: float) -> str:
+	return str(int(bound)) if float(bound).is_integer() else str(bound)
+
+
+def band_label(value: Optional[float], bounds: Sequence[float]) -> str:
+	if value is None:
+		return NO_VALUE
+	lower = 0.0
+	for upper in bounds:
+		if value < upper:
+			return f"{_fmt(lower)}-{_fmt(upper)}"
+		lower = upper
+	return f"{_fmt(lower)}+"
+
+
+def bands_in_range(low: Optional[float], high: Optional[float], bounds: Sequence[float]) -> List[str]:
+	"""Return the labels of every band overlapping [low, high]; None means unbounded."""
+	labels: List[str] = []
+	lower = 0.0
+	for upper in list(bounds) + [None]:
+		above_low = low is None or upper is None or upper > low
+		below_high = high is None or lower <= high
+		if above_low and below_high:
+			labels.append(f"{_fmt(lower)}-{_fmt(upper)}" if upper is not None else f"{_fmt(lower)}+")
+		if upper is not None:
+			lower = upper
+	return labels
+
+
+def value_sort_key(value: Any) -> tuple:
+	"""Order facet values for display: bands by lower bound, everything else by name."""
+	text = str(value)
+	head = text.split("-", 1)[0].rstrip("+")
+	try:
+		return (0, float(head), text)
+	except ValueError:
+		return (1, 0.0, text.lower())
+
+
+def _popcount(bits: int) -> int:
+	return bin(bits).count("1")
+
+
+class FacetIndex:
+	"""Per-facet-value bitsets over the catalog for instant conditional counts.
+
+	Each product owns one bit position; a facet value maps to the int whose set
+	bits are the products carrying that value. Counting under the current
+	filters is then a handful of ANDs and popcounts, with no database access.
+	"""
+
+	def __init__(
+		self,
+		price_bounds: Sequence[float] = DEFAULT_PRICE_BOUNDS,
+		cc_bounds: Sequence[float] = DEFAULT_CC_BOUNDS,
+	) -> None:
+		self.price_bounds = tuple(sorted(price_bounds))
+		self.cc_bounds = tuple(sorted(cc_bounds))
+		self._slots: Dict[str, int] = {}
+		self._ids: Dict[int, str] = {}
+		self._free: List[int] = []
+		self._all = 0
+		self._values: Dict[str, Dict[str, Any]] = {}
+		self._bits: Dict[str, Dict[Any, int]] = {facet: {} for facet in FACETS}
+
+	def __len__(self) -> int:
+		return len(self._slots)
+
+	@classmethod
+	def build(cls, products: Iterable[Dict[str, Any]], **kwargs: Any) -> "FacetIndex":
+		index = cls(**kwargs)
+		for product in products:
+			index.add(product)
+		return index
+
+	def facet_values(self, product: Dict[str, Any]) -> Dict[str, Any]:
+		price = product.get("price")
+		engine_cc = product.get("engine_cc")
+		return {
+			"brand": product.get("brand") or NO_VALUE,
+			"category_id": product.get("category_id") or NO_VALUE,
+			"is_electric": bool(product.get("is_electric")),
+			"price_band": band_label(float(price) if price is not None else None, self.price_bounds),
+			"cc_band": band_label(float(engine_cc) if engine_cc is not None else None, self.cc_bounds),
+		}
+
+	def add(self, product: Dict[str, Any]) -> None:
+		"""Insert or re-index a product row."""
+		prod_id = str(product.get("prod_id"))
+		self.remove(prod_id)
+		slot = self._free.pop() if self._free else len(self._slots) + len(self._free)
+		bit = 1 << slot
+		values = self.facet_values(product)
+		self._slots[prod_id] = slot
+		self._ids[slot] = prod_id
+		self._values[prod_id] = values
+		self._all |= bit
+		for facet, value in values.items():
+			bits = self._bits[facet]
+			bits[value] = bits.get(value, 0) | bit
+
+	def remove(self, prod_id: str) -> None:
+		slot = self._slots.pop(prod_id, None)
+		if slot is None:
+			return
+		bit = 1 << slot
+		del self._ids[slot]
+		self._free.append(slot)
+		self._all &= ~bit
+		for facet, value in self._values.pop(prod_id).items():
+			bits = self._bits[facet]
+			remaining = bits[value] & ~bit
+			if remaining:
+				bits[value] = remaining
+			else:
+				del bits[value]
+
+	def counts(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[Any, int]]:
+		"""Return {facet: {value: count}} for products matching the other facets' filters.
+
+		A facet's own selection is left out when counting it, so the counts show
+		what each alternative value would yield. Filter values may be a single
+		value or a list of values to OR together.
+		"""
+		masks = self._masks(filters or {})
+		result: Dict[str, Dict[Any, int]] = {}
+		for facet in FACETS:
+			mask = self._all
+			for other, other_mask in masks.items():
+				if other != facet:
+					mask &= other_mask
+			result[facet] = {
+				value: count
+				for value, bits in self._bits[facet].items()
+				if (count := _popcount(bits & mask))
+			}
+		return result
+
+	def match(self, filters: Optional[Dict[str, Any]] = None) -> List[str]:
+		"""Return the prod_ids matching every filter."""
+		mask = self._all
+		for facet_mask in self._masks(filters or {}).values():
+			mask &= facet_mask
+		ids: List[str] = []
+		while mask:
+			low = mask & -mask
+			ids.append(self._ids[low.bit_length() - 1])
+			mask ^= low
+		return ids
+
+	def _masks(self, filters: Dict[str, Any]) -> Dict[str, int]:
+		masks: Dict[str, int] = {}
+		for facet, selected in filters.items():
+			if facet not in self._bits or selected is None:
+				continue
+			values = selected if isinstance(selected, (list, tuple, set, frozenset)) else [selected]
+			mask = 0
+			for value in values:
+				mask |= self._bits[facet].get(value, 0)
+			masks[facet] = mask
+		return masks
@@ -0,0 +1,83 @@
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+
+def normalize_city(city: Optional[str]) -> str:
+	return (city or "").strip().lower()
+
+
+class InventoryIndex:
+	"""In-memory city -> store -> (prod_id, stock) index over store_inventory.
+
+	Per-city totals are maintained alongside the per-store map so a location
+	lookup is a single dict access instead of a join against the database.
+	"""
+
+	def __init__(self) -> None:
+		self._store_city: Dict[str, str] = {}
+		self._stores: Dict[str, Dict[str, Dict[str, int]]] = {}
+		self._city_totals: Dict[str, Dict[str, int]] = {}
+
+	@classmethod
+	def build(cls, stores: Iterable[Dict[str, Any]], inventory: Iterable[Dict[str, Any]]) -> "InventoryIndex":
+		index = cls()
+		for store in stores:
+			index.add_store(str(store.get("store_id")), store.get("city"))
+		for row in inventory:
+			stock = row.get("stock")
+			index.set_stock(str(row.get("store_id")), str(row.get("prod_id")), int(stock) if stock is not None else 0)
+		return index
+
+	def add_store(self, store_id: str, city: Optional[str]) -> None:
+		city_key = normalize_city(city)
+		old_city = self._store_city.get(store_id)
+		if old_city == city_key:
+			return
+		stock = {}
+		if old_city is not None:
+			stock = self._stores[old_city].pop(store_id, {})
+			for prod_id, qty in stock.items():
+				self._adjust_total(old_city, prod_id, -qty)
+		self._store_city[store_id] = city_key
+		self._stores.setdefault(city_key, {})[store_id] = stock
+		for prod_id, qty in stock.items():
+			self._adjust_total(city_key, prod_id, qty)
+
+	def remove_store(self, store_id: str) -> None:
+		city_key = self._store_city.pop(store_id, None)
+		if city_key is None:
+			return
+		for prod_id, qty in self._stores[city_key].pop(store_id, {}).items():
+			self._adjust_total(city_key, prod_id, -qty)
+
+	def set_stock(self, store_id: str, prod_id: str, stock: int) -> None:
+		"""Record the absolute stock for one store/product pair, patching city totals."""
+		city_key = self._store_city.get(store_id)
+		if city_key is None:
+			# Unknown store: keep it addressable until its city is learned
+			self.add_store(store_id, None)
+			city_key = ""
+		store_stock = self._stores[city_key][store_id]
+		delta = max(stock, 0) - store_stock.get(prod_id, 0)
+		if stock > 0:
+			store_stock[prod_id] = stock
+		else:
+			store_stock.pop(prod_id, None)
+		self._adjust_total(city_key, prod_id, delta)
+
+	def has_store(self, store_id: str) -> bool:
+		return store_id in self._store_city
+
+	def stock_in_city(self, city: Optional[str]) -> Mapping[str, int]:
+		"""Return a read-only {prod_id: total stock} view of products in stock in the city."""
+		return MappingProxyType(self._city_totals.get(normalize_city(city), {}))
+
+	def _adjust_total(self, city_key: str, prod_id: str, delta: int) -> None:
+		if delta == 0:
+			return
+		totals = self._city_totals.setdefault(city_key, {})
+		value = totals.get(prod_id, 0) + delta
+		if value > 0:
+			totals[prod_id] = value
+		else:
+			totals.pop(prod_id, None)
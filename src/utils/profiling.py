@@ -0,0 +1,220 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+ENV_VAR = "REVPICK_PROFILE"
+
+_output_dir: Optional[Path] = None
+_state = threading.local()
+_counter_lock = threading.Lock()
+_counter = 0
+# tracemalloc is process-wide; concurrent operations share one tracing session
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def enable(output_dir: str = "profiles") -> Path:
+	"""Turn on profiling for every @profiled call; reports go to output_dir."""
+	global _output_dir
+	_output_dir = Path(output_dir)
+	_output_dir.mkdir(parents=True, exist_ok=True)
+	return _output_dir
+
+
+def enable_from_env() -> Optional[Path]:
+	"""Enable profiling when REVPICK_PROFILE is set (to an output dir, or 1 for ./profiles)."""
+	value = os.getenv(ENV_VAR, "").strip()
+	if not value or value.lower() in ("0", "false", "no"):
+		return None
+	return enable("profiles" if value.lower() in ("1", "true", "yes") else value)
+
+
+def is_enabled() -> bool:
+	return _output_dir is not None
+
+
+@contextmanager
+def span(category: str) -> Iterator[None]:
+	"""Attribute the wall time of a block (e.g. network, decode) to the running operation."""
+	op = getattr(_state, "op", None)
+	if op is None:
+		yield
+		return
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		op["spans"][category] = op["spans"].get(category, 0.0) + time.perf_counter() - start
+
+
+def profiled(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+	"""Profile the outermost call of the wrapped function when profiling is enabled.
+
+	Nested profiled calls run inside the outer operation's profile, since only
+	one cProfile can be active per thread.
+	"""
+
+	def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+		@functools.wraps(fn)
+		def wrapper(*args: Any, **kwargs: Any) -> Any:
+			if _output_dir is None or getattr(_state, "op", None) is not None:
+				return fn(*args, **kwargs)
+			return _run_profiled(name, fn, args, kwargs)
+
+		return wrapper
+
+	return decorator
+
+
+def _acquire_tracing() -> None:
+	global _tracing_users, _tracing_owned
+	with _tracing_lock:
+		if _tracing_users == 0 and not tracemalloc.is_tracing():
+			tracemalloc.start()
+			_tracing_owned = True
+		_tracing_users += 1
+
+
+def _release_tracing() -> None:
+	global _tracing_users, _tracing_owned
+	with _tracing_lock:
+		_tracing_users -= 1
+		if _tracing_users == 0 and _tracing_owned:
+			tracemalloc.stop()
+			_tracing_owned = False
+
+
+def _run_profiled(name: str, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+	# Allocation diffs of overlapping operations include each other's allocations
+	_state.op = {"spans": {}}
+	_acquire_tracing()
+	before = tracemalloc.take_snapshot()
+	profiler = cProfile.Profile()
+	start = time.perf_counter()
+	try:
+		profiler.enable()
+		try:
+			return fn(*args, **kwargs)
+		finally:
+			profiler.disable()
+	finally:
+		elapsed = time.perf_counter() - start
+		after = tracemalloc.take_snapshot()
+		_release_tracing()
+		spans = _state.op["spans"]
+		_state.op = None
+		_write_reports(name, profiler, elapsed, spans, before, after)
+
+
+def _write_reports(
+	name: str,
+	profiler: cProfile.Profile,
+	elapsed: float,
+	spans: Dict[str, float],
+	before: tracemalloc.Snapshot,
+	after: tracemalloc.Snapshot,
+) -> None:
+	global _counter
+	if _output_dir is None:
+		return
+	with _counter_lock:
+		_counter += 1
+		seq = _counter
+	stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{seq:04d}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}"
+	stats = pstats.Stats(profiler)
+	stats.dump_stats(str(_output_dir / f"{stem}.prof"))
+
+	out = io.StringIO()
+	out.write(f"Operation: {name}\n")
+	out.write(f"Wall time: {elapsed * 1000:.2f} ms\n\n")
+	out.write("Time split:\n")
+	accounted = 0.0
+	for category in ("network", "decode"):
+		value = spans.get(category, 0.0)
+		accounted += value
+		out.write(f"  {category:<8} {value * 1000:10.2f} ms  {_percent(value, elapsed)}\n")
+	python_time = max(elapsed - accounted, 0.0)
+	out.write(f"  {'python':<8} {python_time * 1000:10.2f} ms  {_percent(python_time, elapsed)}\n\n")
+
+	out.write("Top functions by cumulative time:\n")
+	stats.stream = out
+	stats.sort_stats("cumulative").print_stats(25)
+
+	out.write("Allocation hot spots (net new memory by line):\n")
+	diffs = [d for d in after.compare_to(before, "lineno") if d.size_diff > 0 and not _is_internal(d)]
+	for diff in diffs[:15]:
+		frame = diff.traceback[0]
+		out.write(f"  {diff.size_diff / 1024:10.1f} KiB  {diff.count_diff:+7d} blocks  {frame.filename}:{frame.lineno}\n")
+	if not diffs:
+		out.write("  (none)\n")
+
+	(_output_dir / f"{stem}.txt").write_text(out.getvalue(), encoding="utf-8")
+	(_output_dir / f"{stem}.collapsed").write_text(collapsed_stacks(stats), encoding="utf-8")
+
+
+def _percent(value: float, total: float) -> str:
+	return f"{(value / total * 100) if total > 0 else 0.0:5.1f}%"
+
+
+def _is_internal(diff: tracemalloc.StatisticDiff) -> bool:
+	filename = diff.traceback[0].filename
+	return filename == __file__ or filename.endswith(("tracemalloc.py", "cProfile.py", "pstats.py"))
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+	filename, lineno, funcname = func
+	if filename == "~":
+		return funcname.replace(";", ",")
+	return f"{funcname} ({os.path.basename(filename)}:{lineno})".replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 64) -> str:
+	"""Render cProfile data as collapsed stacks ("a;b;c <microseconds>") for flamegraph tools.
+
+	cProfile only records caller/callee pairs, so time below a function is split
+	across its callers in proportion to each call edge's cumulative time.
+	"""
+	raw = stats.stats  # type: ignore[attr-defined]
+	callees: Dict[Any, Dict[Any, Tuple[Any, ...]]] = {}
+	for func, (_, _, _, _, callers) in raw.items():
+		for caller, edge in callers.items():
+			callees.setdefault(caller, {})[func] = edge
+	totals: Dict[str, float] = {}
+
+	def walk(func: Any, path: Tuple[Any, ...], labels: Tuple[str, ...], scale: float) -> None:
+		_, _, own_time, _, _ = raw[func]
+		labels = labels + (_label(func),)
+		path = path + (func,)
+		key = ";".join(labels)
+		totals[key] = totals.get(key, 0.0) + own_time * scale
+		if len(path) >= max_depth:
+			return
+		for child, edge in callees.get(func, {}).items():
+			child_total = raw[child][3]
+			if child in path or child_total <= 0:
+				continue
+			child_scale = scale * edge[3] / child_total
+			if child_scale * child_total < 1e-6:
+				continue
+			walk(child, path, labels, child_scale)
+
+	for func, (_, _, _, _, callers) in raw.items():
+		# Skip the profiler's own disable() call, which shows up as a root
+		if not callers and "_lsprof.Profiler" not in func[2]:
+			walk(func, (), (), 1.0)
+	lines: List[str] = []
+	for key, seconds in sorted(totals.items()):
+		micros = int(round(seconds * 1_000_000))
+		if micros > 0:
+			lines.append(f"{key} {micros}")
+	return "\n".join(lines) + ("\n" if lines else "")
@@ -0,0 +1,85 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+	return _TOKEN_RE.findall((text or "").lower())
+
+
+def trigrams(text: str, prefix: bool = False) -> Set[str]:
+	"""Return padded word trigrams; with prefix=True the last word is left open-ended."""
+	words = _tokens(text)
+	grams: Set[str] = set()
+	for pos, word in enumerate(words):
+		padded = f"  {word}" if prefix and pos == len(words) - 1 else f"  {word} "
+		for i in range(len(padded) - 2):
+			grams.add(padded[i:i + 3])
+	return grams
+
+
+class TrigramIndex:
+	"""Inverted trigram index for ranked fuzzy prefix/substring lookups."""
+
+	def __init__(self, min_score: float = 0.3) -> None:
+		self.min_score = min_score
+		self._postings: Dict[str, Set[str]] = {}
+		self._doc_grams: Dict[str, Set[str]] = {}
+		self._doc_text: Dict[str, str] = {}
+
+	def __len__(self) -> int:
+		return len(self._doc_grams)
+
+	def add(self, doc_id: str, *fields: Optional[str]) -> None:
+		"""Index (or re-index) a document from one or more text fields."""
+		self.remove(doc_id)
+		text = " ".join(f for f in fields if f)
+		grams = trigrams(text)
+		self._doc_grams[doc_id] = grams
+		self._doc_text[doc_id] = " ".join(_tokens(text))
+		for gram in grams:
+			self._postings.setdefault(gram, set()).add(doc_id)
+
+	def remove(self, doc_id: str) -> None:
+		grams = self._doc_grams.pop(doc_id, None)
+		self._doc_text.pop(doc_id, None)
+		if not grams:
+			return
+		for gram in grams:
+			docs = self._postings.get(gram)
+			if docs is None:
+				continue
+			docs.discard(doc_id)
+			if not docs:
+				del self._postings[gram]
+
+	def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+		"""Return up to `limit` (doc_id, score) pairs, best match first."""
+		query_grams = trigrams(query, prefix=True)
+		if not query_grams:
+			return []
+		hits: Dict[str, int] = {}
+		for gram in query_grams:
+			for doc_id in self._postings.get(gram, ()):
+				hits[doc_id] = hits.get(doc_id, 0) + 1
+		needle = " ".join(_tokens(query))
+		ranked: List[Tuple[float, int, str]] = []
+		for doc_id, count in hits.items():
+			score = count / len(query_grams)
+			if score < self.min_score:
+				continue
+			text = self._doc_text[doc_id]
+			# Exact substring matches outrank equally similar fuzzy ones
+			if needle in text:
+				score += 1.0 if text.startswith(needle) or f" {needle}" in text else 0.5
+			ranked.append((score, len(text), doc_id))
+		ranked.sort(key=lambda r: (-r[0], r[1], r[2]))
+		return [(doc_id, score) for score, _, doc_id in ranked[:limit]]
+
+	@classmethod
+	def build(cls, docs: Iterable[Tuple[str, Iterable[Optional[str]]]], min_score: float = 0.3) -> "TrigramIndex":
+		index = cls(min_score=min_score)
+		for doc_id, fields in docs:
+			index.add(doc_id, *fields)
+		return index
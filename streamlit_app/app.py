@@ -1,10 +1,22 @@
 import os
+import sys
 from datetime import datetime
 
 import streamlit as st
 
+# Reuse the in-memory indexes from the CLI package
+_SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if _SRC_DIR not in sys.path:
+	sys.path.insert(0, _SRC_DIR)
+
+from dao.catalog_change_dao import CatalogChangeDAO
+from services.change_feed import ChangeFeed
+from utils import profiling
+from utils.catalog_indexes import CatalogIndexes
+from utils.facets import DEFAULT_CC_BOUNDS, DEFAULT_PRICE_BOUNDS, NO_VALUE, bands_in_range, value_sort_key
 
 st.set_page_config(page_title="RevPick", page_icon="🏍️", layout="wide")
+profiling.enable_from_env()
 
 
 def init_connection():
@@ -27,8 +39,75 @@ def init_connection():
 supabase = init_connection()
 
 
+def execute(query):
+	"""Run a supabase-py query, timing it as network for profiling (the SDK decodes JSON inside)."""
+	with profiling.span("network"):
+		return query.execute()
+
+
+def poll_changes(feed):
+	with profiling.span("network"):
+		feed.poll()
+
+
+@st.cache_resource(show_spinner=False)
+def load_catalog_indexes():
+	"""Build the search and facet indexes once per server process, kept fresh by the change feed.
+
+	Both objects are shared by every session thread; CatalogIndexes and
+	ChangeFeed lock internally, so concurrent polls and reads are safe.
+	"""
+	feed = ChangeFeed(CatalogChangeDAO(supabase))
+	feed.poll(force=True)
+	indexes = CatalogIndexes.build(execute(supabase.table("products").select("*")).data or [])
+	feed.subscribe(indexes.apply_change)
+	return indexes, feed
+
+
+def search_box():
+	query = st.text_input("Search by name or brand", placeholder="e.g. royal enfield, ninja")
+	if not query.strip() or not supabase:
+		return
+	indexes, feed = load_catalog_indexes()
+	poll_changes(feed)
+	matches = indexes.search(query, limit=10)
+	if not matches:
+		st.info("No bikes matched your search.")
+		return
+	display = [{k: v for k, v in r.items() if k not in {"prod_id", "created_at", "is_electric"}} for r in matches]
+	st.dataframe(display, use_container_width=True)
+
+
+def facet_breakdown(type_choice, min_price, max_price, min_cc, max_cc):
+	"""Show how many bikes fall in each brand, price band and CC band, without querying."""
+	if not supabase:
+		return
+	indexes, feed = load_catalog_indexes()
+	poll_changes(feed)
+	filters = {}
+	if type_choice in ("ICE", "EV"):
+		filters["is_electric"] = type_choice == "EV"
+	if min_price or max_price:
+		filters["price_band"] = bands_in_range(min_price or None, max_price or None, DEFAULT_PRICE_BOUNDS)
+	if min_cc or max_cc:
+		# Search applies CC limits to ICE bikes only, so EVs (no CC) still count
+		cc_bands = bands_in_range(min_cc or None, max_cc or None, DEFAULT_CC_BOUNDS)
+		filters["cc_band"] = cc_bands + ([NO_VALUE] if type_choice in ("Any", "EV") else [])
+	counts = indexes.facet_counts(filters)
+	with st.expander("Bikes per filter value", expanded=False):
+		cols = st.columns(3)
+		for col, (facet, title) in zip(cols, (("brand", "Brand"), ("price_band", "Price band (₹)"), ("cc_band", "Engine CC band"))):
+			with col:
+				st.caption(title)
+				rows = sorted(counts.get(facet, {}).items(), key=lambda kv: value_sort_key(kv[0]))
+				st.dataframe([{title: value, "Bikes": n} for value, n in rows], use_container_width=True, hide_index=True)
+		st.caption("Counts follow the last submitted filters. Prices and CC are grouped into bands, so a band that only partly overlaps your range is counted in full.")
+
+
+@profiling.profiled("streamlit.view_products")
 def view_products():
 	st.header("Find Bikes")
+	search_box()
 
 	with st.form("finder_form", clear_on_submit=False):
 		col1, col2, col3 = st.columns(3)
@@ -47,6 +126,8 @@ def view_products():
 
 		submitted = st.form_submit_button("Search")
 
+	facet_breakdown(type_choice, min_price, max_price, min_cc, max_cc)
+
 	if not submitted:
 		st.info("Set your filters and press Search.")
 		return
@@ -74,13 +155,13 @@ def view_products():
 			if max_cc and max_cc > 0:
 				q_ice = q_ice.lte("engine_cc", max_cc)
 			q_ice = apply_price_filters(q_ice)
-			ice_resp = q_ice.order("price").execute()
+			ice_resp = execute(q_ice.order("price"))
 			results.extend(ice_resp.data or [])
 
 		if type_choice in ("Any", "EV"):
 			q_ev = supabase.table("products").select("*").eq("is_electric", True)
 			q_ev = apply_price_filters(q_ev)
-			ev_resp = q_ev.order("price").execute()
+			ev_resp = execute(q_ev.order("price"))
 			results.extend(ev_resp.data or [])
 
 		# Deduplicate by prod_id when present, otherwise by (brand,name,engine_cc,power_kw,price)
@@ -110,7 +191,7 @@ def view_products():
 def view_customers():
 	st.header("Customers")
 	if supabase:
-		resp = supabase.table("customers").select("*").order("created_at", desc=True).execute()
+		resp = execute(supabase.table("customers").select("*").order("created_at", desc=True))
 		st.dataframe(resp.data or [], use_container_width=True)
 	else:
 		st.dataframe([{"name": "Alice", "email": "alice@example.com", "city": "Pune"}], use_container_width=True)
@@ -128,7 +209,7 @@ def view_customers():
 				else:
 					payload = {"name": name, "email": email or None, "phone": phone or None, "city": city or None}
 					try:
-						res = supabase.table("customers").insert(payload).execute()
+						res = execute(supabase.table("customers").insert(payload))
 						if res.data:
 							st.success("Customer created.")
 							st.experimental_rerun()
@@ -141,8 +222,8 @@ def view_customers():
 def view_suggestions():
 	st.header("Suggestions")
 	if supabase:
-		customers = (supabase.table("customers").select("cust_id,name").order("name").execute().data or [])
-		products = (supabase.table("products").select("prod_id,name,brand").order("brand").execute().data or [])
+		customers = (execute(supabase.table("customers").select("cust_id,name").order("name")).data or [])
+		products = (execute(supabase.table("products").select("prod_id,name,brand").order("brand")).data or [])
 		cust_name_to_id = {f"{c['name']}": c["cust_id"] for c in customers}
 		prod_name_to_id = {f"{p['brand']} - {p['name']}": p["prod_id"] for p in products}
 	else:
@@ -159,7 +240,7 @@ def view_suggestions():
 			else:
 				payload = {"cust_id": cust_name_to_id[cust_choice], "prod_id": prod_name_to_id[prod_choice]}
 				try:
-					res = supabase.table("suggestions").insert(payload).execute()
+					res = execute(supabase.table("suggestions").insert(payload))
 					if res.data:
 						st.success("Suggestion logged.")
 						st.experimental_rerun()
@@ -169,7 +250,7 @@ def view_suggestions():
 					st.error(f"Insert failed: {e}")
 
 	if supabase:
-		resp = supabase.table("suggestions").select("*, customers(name), products(name,brand)").order("date_requested", desc=True).execute()
+		resp = execute(supabase.table("suggestions").select("*, customers(name), products(name,brand)").order("date_requested", desc=True))
 		rows = resp.data or []
 		for r in rows:
 			st.write(
@@ -1,7 +1,9 @@
 -- =========================
 -- Drop existing tables
 -- =========================
+DROP TABLE IF EXISTS public.catalog_changes;
 DROP TABLE IF EXISTS public.suggestions;
+DROP TABLE IF EXISTS public.store_inventory;
 DROP TABLE IF EXISTS public.stores;
 DROP TABLE IF EXISTS public.customers;
 DROP TABLE IF EXISTS public.products;
@@ -60,11 +62,21 @@ CREATE TABLE public.customers (
 CREATE TABLE public.stores (
   store_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   name TEXT NOT NULL,
+  city TEXT NOT NULL,
   location TEXT,
   contact TEXT,
   created_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- Per-store stock
+CREATE TABLE public.store_inventory (
+  store_id UUID NOT NULL REFERENCES public.stores(store_id) ON UPDATE CASCADE ON DELETE CASCADE,
+  prod_id UUID NOT NULL REFERENCES public.products(prod_id) ON UPDATE CASCADE ON DELETE CASCADE,
+  stock INTEGER NOT NULL DEFAULT 0 CHECK (stock >= 0),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (store_id, prod_id)
+);
+
 -- Suggestions
 CREATE TABLE public.suggestions (
   suggestion_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -82,6 +94,8 @@ CREATE INDEX idx_products_price ON public.products(price);
 CREATE INDEX idx_products_is_electric ON public.products(is_electric);
 CREATE INDEX idx_products_cc ON public.products(engine_cc);
 CREATE INDEX idx_customers_city ON public.customers(city);
+CREATE INDEX idx_stores_city ON public.stores(city);
+CREATE INDEX idx_store_inventory_prod ON public.store_inventory(prod_id);
 CREATE INDEX idx_suggestions_cust ON public.suggestions(cust_id);
 CREATE INDEX idx_suggestions_prod ON public.suggestions(prod_id);
 
@@ -212,3 +226,113 @@ VALUES
 ('Yamaha R1M', 998, 2200000, 2, (SELECT category_id FROM cat WHERE name='Supersport'), 'Yamaha', FALSE, NULL, 200.00, 112.00, 14.50),
 ('Kawasaki Ninja ZX-6R', 636, 1200000, 3, (SELECT category_id FROM cat WHERE name='Supersport'), 'Kawasaki', FALSE, NULL, 127.00, 70.00, 17.00),
 ('Suzuki GSX-R750', 749, 1500000, 2, (SELECT category_id FROM cat WHERE name='Supersport'), 'Suzuki', FALSE, NULL, 145.0, 95.0, 15.0);
+
+-- =========================
+-- Seed: Stores/Dealers
+-- =========================
+INSERT INTO public.stores (name, city, location, contact) VALUES
+  ('RevPick Pune Central', 'Pune', 'FC Road, Shivajinagar', '+91-20-5550-0101'),
+  ('RevPick Pune Hinjewadi', 'Pune', 'Phase 1, Hinjewadi', '+91-20-5550-0102'),
+  ('RevPick Mumbai Andheri', 'Mumbai', 'Andheri East', '+91-22-5550-0201'),
+  ('RevPick Bengaluru Indiranagar', 'Bengaluru', '100 Feet Road, Indiranagar', '+91-80-5550-0301'),
+  ('RevPick Delhi Karol Bagh', 'Delhi', 'Karol Bagh', '+91-11-5550-0401');
+
+-- =========================
+-- Seed: Store inventory (spread each bike's stock across stores; the first
+-- store takes the remainder so every unit of products.stock is placed)
+-- =========================
+WITH ranked AS (
+  SELECT store_id, row_number() OVER (ORDER BY name) AS rn, count(*) OVER () AS n
+  FROM public.stores
+)
+INSERT INTO public.store_inventory (store_id, prod_id, stock)
+SELECT r.store_id, p.prod_id,
+       p.stock / r.n + CASE WHEN r.rn = 1 THEN p.stock % r.n ELSE 0 END
+FROM ranked r
+CROSS JOIN public.products p
+WHERE p.stock / r.n + CASE WHEN r.rn = 1 THEN p.stock % r.n ELSE 0 END > 0;
+
+-- =========================
+-- Stock reconciliation
+-- =========================
+-- store_inventory is the authoritative stock record. products.stock is the
+-- derived total across all stores, recomputed whenever a store's stock changes,
+-- so it should not be written directly.
+CREATE OR REPLACE FUNCTION public.sync_product_stock() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  pid UUID := CASE WHEN TG_OP = 'DELETE' THEN OLD.prod_id ELSE NEW.prod_id END;
+BEGIN
+  UPDATE public.products
+  SET stock = COALESCE((SELECT SUM(stock) FROM public.store_inventory WHERE prod_id = pid), 0)
+  WHERE prod_id = pid;
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_store_inventory_sync_stock
+  AFTER INSERT OR UPDATE OR DELETE ON public.store_inventory
+  FOR EACH ROW EXECUTE FUNCTION public.sync_product_stock();
+
+-- =========================
+-- Change feed
+-- =========================
+-- Every write to the catalog tables appends a row here. Clients remember the
+-- highest version they have applied and poll for newer rows to patch their
+-- in-memory caches. Created after the seeds so the initial load is not logged.
+-- Versions come from a sequence and can become visible out of order, so the
+-- client poller waits for gaps to fill before moving its cursor past them.
+CREATE TABLE public.catalog_changes (
+  version BIGSERIAL PRIMARY KEY,
+  table_name TEXT NOT NULL,
+  op TEXT NOT NULL CHECK (op IN ('INSERT', 'UPDATE', 'DELETE')),
+  prod_id UUID,
+  store_id UUID,
+  row_data JSONB,
+  changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION public.log_catalog_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  rec JSONB := CASE WHEN TG_OP = 'DELETE' THEN to_jsonb(OLD) ELSE to_jsonb(NEW) END;
+BEGIN
+  INSERT INTO public.catalog_changes (table_name, op, prod_id, store_id, row_data)
+  VALUES (
+    TG_TABLE_NAME,
+    TG_OP,
+    (rec->>'prod_id')::uuid,
+    (rec->>'store_id')::uuid,
+    CASE WHEN TG_OP = 'DELETE' THEN NULL ELSE rec END
+  );
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_products_catalog_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.products
+  FOR EACH ROW EXECUTE FUNCTION public.log_catalog_change();
+
+CREATE TRIGGER trg_stores_catalog_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.stores
+  FOR EACH ROW EXECUTE FUNCTION public.log_catalog_change();
+
+CREATE TRIGGER trg_store_inventory_catalog_change
+  AFTER INSERT OR UPDATE OR DELETE ON public.store_inventory
+  FOR EACH ROW EXECUTE FUNCTION public.log_catalog_change();
+
+CREATE INDEX idx_catalog_changes_changed_at ON public.catalog_changes(changed_at);
+
+-- Retention: keep a week of changes. Clients only need rows newer than their
+-- last poll, so a week is ample; a process idle for longer should restart to
+-- rebuild its caches. Schedule with pg_cron, e.g.
+--   SELECT cron.schedule('prune-catalog-changes', '0 3 * * *',
+--                        $$SELECT public.prune_catalog_changes()$$);
+CREATE OR REPLACE FUNCTION public.prune_catalog_changes(keep INTERVAL DEFAULT INTERVAL '7 days')
+RETURNS INTEGER
+LANGUAGE sql AS $$
+  WITH deleted AS (
+    DELETE FROM public.catalog_changes WHERE changed_at < now() - keep RETURNING 1
+  )
+  SELECT count(*)::INTEGER FROM deleted;
+$$;
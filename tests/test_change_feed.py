@@ -0,0 +1,108 @@
+import pytest
+
+from services import change_feed
+from services.change_feed import ChangeFeed
+
+
+class FakeChangeDAO:
+	def __init__(self, head=0):
+		self.head = head
+		self.rows = []
+		self.calls = []
+
+	def commit(self, *versions):
+		self.rows.extend({"version": v, "table_name": "products", "op": "UPDATE"} for v in versions)
+
+	def latest_version(self):
+		return self.head
+
+	def list_since(self, version, limit=500):
+		self.calls.append(version)
+		visible = sorted((r for r in self.rows if r["version"] > version), key=lambda r: r["version"])
+		return visible[:limit]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	now = [1000.0]
+	monkeypatch.setattr(change_feed.time, "monotonic", lambda: now[0])
+	return now
+
+
+def _feed(dao, **kwargs):
+	kwargs.setdefault("min_interval", 0)
+	feed = ChangeFeed(dao, **kwargs)
+	seen = []
+	feed.subscribe(lambda change: seen.append(change["version"]))
+	return feed, seen
+
+
+def test_first_poll_sets_baseline_behind_head(clock):
+	dao = FakeChangeDAO(head=500)
+	feed, seen = _feed(dao, replay_window=200)
+	assert feed.poll() == 0
+	assert feed.last_version == 300
+	assert dao.calls == []
+	# Changes inside the replay window are applied on the next poll
+	dao.commit(450, 501)
+	assert feed.poll() == 2
+	assert seen == [450, 501]
+
+
+def test_out_of_order_versions_wait_for_gap(clock):
+	dao = FakeChangeDAO()
+	feed, seen = _feed(dao)
+	feed.poll()
+	dao.commit(1, 3)
+	assert feed.poll() == 2
+	assert feed.last_version == 1
+	# 3 is not re-applied while the cursor waits below it
+	assert feed.poll() == 0
+	dao.commit(2)
+	clock[0] += 5
+	assert feed.poll() == 1
+	assert seen == [1, 3, 2]
+	assert feed.last_version == 3
+	assert feed._applied == set() and feed._gaps == {}
+
+
+def test_gap_times_out_and_late_row_is_skipped(clock):
+	dao = FakeChangeDAO()
+	feed, seen = _feed(dao, gap_timeout=60)
+	feed.poll()
+	dao.commit(1, 3)
+	feed.poll()
+	clock[0] += 59
+	feed.poll()
+	assert feed.last_version == 1
+	clock[0] += 1
+	feed.poll()
+	assert feed.last_version == 3
+	# Documented limit: a row that shows up after its gap timed out is never applied
+	dao.commit(2)
+	assert feed.poll() == 0
+	assert seen == [1, 3]
+
+
+def test_batch_paging_reads_everything(clock):
+	dao = FakeChangeDAO()
+	feed, seen = _feed(dao, batch_size=2)
+	feed.poll()
+	dao.commit(1, 2, 3, 4, 5)
+	assert feed.poll() == 5
+	assert seen == [1, 2, 3, 4, 5]
+	assert dao.calls == [0, 2, 4]
+	assert feed.last_version == 5
+
+
+def test_polls_are_throttled(clock):
+	dao = FakeChangeDAO()
+	feed, seen = _feed(dao, min_interval=2.0)
+	feed.poll()
+	dao.commit(1)
+	assert feed.poll() == 0
+	assert feed.poll(force=True) == 1
+	clock[0] += 2
+	dao.commit(2)
+	assert feed.poll() == 1
+	assert seen == [1, 2]
@@ -0,0 +1,74 @@
+from utils.facets import NO_VALUE, FacetIndex, band_label, bands_in_range
+
+
+def _bike(prod_id, brand, price, engine_cc, is_electric=False):
+	return {"prod_id": prod_id, "brand": brand, "price": price, "engine_cc": engine_cc, "is_electric": is_electric}
+
+
+def _index():
+	return FacetIndex.build(
+		[
+			_bike("a", "Honda", 79000, 124),
+			_bike("b", "Honda", 650000, 471),
+			_bike("c", "Ather", 170000, None, is_electric=True),
+			_bike("d", "KTM", 330000, 399),
+		],
+		price_bounds=(100000, 500000),
+		cc_bounds=(200, 400),
+	)
+
+
+def test_band_labels():
+	assert band_label(99999, (100000, 500000)) == "0-100000"
+	assert band_label(100000, (100000, 500000)) == "100000-500000"
+	assert band_label(2000000, (100000, 500000)) == "500000+"
+	assert band_label(None, (100000,)) == NO_VALUE
+
+
+def test_bands_in_range_includes_partial_overlaps():
+	assert bands_in_range(None, None, (100, 200)) == ["0-100", "100-200", "200+"]
+	assert bands_in_range(50, 150, (100, 200)) == ["0-100", "100-200"]
+	assert bands_in_range(250, None, (100, 200)) == ["200+"]
+
+
+def test_unfiltered_counts():
+	counts = _index().counts()
+	assert counts["brand"] == {"Honda": 2, "Ather": 1, "KTM": 1}
+	assert counts["is_electric"] == {False: 3, True: 1}
+	assert counts["cc_band"] == {"0-200": 1, "400+": 1, NO_VALUE: 1, "200-400": 1}
+
+
+def test_conditional_counts_leave_out_own_selection():
+	counts = _index().counts({"brand": "Honda"})
+	# Other brands stay visible so the user can see alternatives
+	assert counts["brand"] == {"Honda": 2, "Ather": 1, "KTM": 1}
+	assert counts["price_band"] == {"0-100000": 1, "500000+": 1}
+	assert counts["is_electric"] == {False: 2}
+
+
+def test_multi_value_filters_are_ored():
+	index = _index()
+	assert sorted(index.match({"brand": ["Honda", "KTM"]})) == ["a", "b", "d"]
+	assert sorted(index.match({"brand": ["Honda", "KTM"], "price_band": "100000-500000"})) == ["d"]
+	assert index.match({"brand": "Nobody"}) == []
+
+
+def test_remove_and_slot_reuse():
+	index = _index()
+	index.remove("a")
+	assert len(index) == 3
+	assert "a" not in index.match()
+	assert index.counts()["brand"]["Honda"] == 1
+	index.add(_bike("e", "TVS", 90000, 110))
+	# The freed slot is reused rather than growing the bitsets
+	assert sorted(index._slots.values()) == [0, 1, 2, 3]
+	assert index.counts()["price_band"]["0-100000"] == 1
+
+
+def test_readd_replaces_previous_values():
+	index = _index()
+	index.add(_bike("b", "Honda", 50000, 471))
+	assert len(index) == 4
+	assert index.counts()["price_band"] == {"0-100000": 2, "100000-500000": 2}
+	index.remove("missing")
+	assert len(index) == 4
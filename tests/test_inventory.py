@@ -0,0 +1,131 @@
+import pytest
+
+import config.supabase_config as supabase_config
+from services import change_feed, inventory_service, product_service
+from utils.inventory_index import InventoryIndex
+
+
+def _index():
+	return InventoryIndex.build(
+		[{"store_id": "s1", "city": "Pune"}, {"store_id": "s2", "city": " pune "}, {"store_id": "s3", "city": "Mumbai"}],
+		[
+			{"store_id": "s1", "prod_id": "p1", "stock": 2},
+			{"store_id": "s2", "prod_id": "p1", "stock": 3},
+			{"store_id": "s3", "prod_id": "p2", "stock": 1},
+		],
+	)
+
+
+def test_city_totals_span_stores_and_ignore_case():
+	index = _index()
+	assert dict(index.stock_in_city("PUNE")) == {"p1": 5}
+	assert dict(index.stock_in_city("mumbai")) == {"p2": 1}
+	assert dict(index.stock_in_city("Delhi")) == {}
+
+
+def test_set_stock_applies_deltas():
+	index = _index()
+	index.set_stock("s1", "p1", 7)
+	assert index.stock_in_city("pune")["p1"] == 10
+	index.set_stock("s1", "p1", 0)
+	assert index.stock_in_city("pune")["p1"] == 3
+	index.set_stock("s2", "p1", 0)
+	assert "p1" not in index.stock_in_city("pune")
+
+
+def test_stock_view_is_read_only():
+	with pytest.raises(TypeError):
+		_index().stock_in_city("pune")["p1"] = 99
+
+
+def test_add_store_moves_stock_to_new_city():
+	index = _index()
+	index.add_store("s2", "Mumbai")
+	assert dict(index.stock_in_city("pune")) == {"p1": 2}
+	assert dict(index.stock_in_city("mumbai")) == {"p1": 3, "p2": 1}
+
+
+def test_remove_store_drops_its_stock():
+	index = _index()
+	index.remove_store("s1")
+	assert dict(index.stock_in_city("pune")) == {"p1": 3}
+	assert not index.has_store("s1")
+	index.remove_store("missing")
+
+
+def test_unknown_store_is_rehomed_when_city_arrives():
+	index = _index()
+	index.set_stock("s9", "p3", 4)
+	assert index.has_store("s9")
+	assert "p3" not in index.stock_in_city("delhi")
+	index.add_store("s9", "Delhi")
+	assert dict(index.stock_in_city("delhi")) == {"p3": 4}
+	assert dict(index.stock_in_city("")) == {}
+
+
+class _Response:
+	def __init__(self, data):
+		self.data = data
+
+
+class _Query:
+	def __init__(self, rows):
+		self.rows = rows
+		self.filters = []
+
+	def select(self, fields):
+		return self
+
+	def eq(self, key, value):
+		self.filters.append(lambda r: str(r.get(key)) == str(value))
+		return self
+
+	def execute(self):
+		return _Response([dict(r) for r in self.rows if all(f(r) for f in self.filters)])
+
+
+class _FakeClient:
+	def __init__(self, tables):
+		self.tables = tables
+
+	def table(self, name):
+		return _Query(self.tables.get(name, []))
+
+
+@pytest.fixture
+def service(monkeypatch):
+	client = _FakeClient(
+		{
+			"products": [
+				{"prod_id": "p1", "name": "Honda Shine 125", "brand": "Honda", "price": 79000, "engine_cc": 124, "stock": 30},
+				{"prod_id": "p2", "name": "KTM 390 Duke", "brand": "KTM", "price": 330000, "engine_cc": 399, "stock": 12},
+				{"prod_id": "p3", "name": "Ather 450X", "brand": "Ather", "price": 170000, "engine_cc": None, "is_electric": True, "stock": 25},
+			],
+			"stores": [{"store_id": "s1", "city": "Pune"}, {"store_id": "s2", "city": "Mumbai"}],
+			"store_inventory": [
+				{"store_id": "s1", "prod_id": "p1", "stock": 4},
+				{"store_id": "s1", "prod_id": "p2", "stock": 1},
+				{"store_id": "s2", "prod_id": "p3", "stock": 6},
+			],
+		}
+	)
+	monkeypatch.setattr(supabase_config, "_cached_client", client)
+	monkeypatch.setattr(change_feed, "_cached_feed", None)
+	monkeypatch.setattr(inventory_service, "_cached_index", None)
+	monkeypatch.setattr(product_service, "_cached_indexes", None)
+	svc = product_service.ProductService()
+	# The feed is exercised in test_change_feed; keep it out of the way here
+	monkeypatch.setattr(svc.feed, "last_version", 0)
+	monkeypatch.setattr(svc.feed, "min_interval", float("inf"))
+	return svc
+
+
+def test_list_bikes_intersects_location_with_other_filters(service):
+	bikes = service.list_bikes(location="pune", max_price=200000)
+	assert [(b["prod_id"], b["stock"]) for b in bikes] == [("p1", 4)]
+	assert [b["prod_id"] for b in service.list_bikes(location="Pune")] == ["p1", "p2"]
+
+
+def test_list_bikes_location_without_stock_returns_nothing(service):
+	assert service.list_bikes(location="Delhi") == []
+	assert len(service.list_bikes()) == 3
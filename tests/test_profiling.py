@@ -0,0 +1,98 @@
+import cProfile
+import pstats
+import threading
+import time
+import tracemalloc
+
+from utils import profiling
+
+
+def _leaf():
+	return sum(i * i for i in range(2000))
+
+
+def _root():
+	return _leaf() + _leaf()
+
+
+def test_collapsed_stacks_format():
+	profiler = cProfile.Profile()
+	profiler.enable()
+	_root()
+	profiler.disable()
+	output = profiling.collapsed_stacks(pstats.Stats(profiler))
+	lines = output.splitlines()
+	assert lines
+	for line in lines:
+		stack, micros = line.rsplit(" ", 1)
+		assert int(micros) > 0
+		assert "_lsprof.Profiler" not in stack
+	assert any("_root (test_profiling.py" in line and "_leaf (test_profiling.py" in line for line in lines)
+
+
+def test_profiled_writes_reports(tmp_path, monkeypatch):
+	monkeypatch.setattr(profiling, "_output_dir", None)
+	profiling.enable(str(tmp_path))
+
+	@profiling.profiled("Demo.inner")
+	def inner():
+		with profiling.span("network"):
+			return _leaf()
+
+	@profiling.profiled("Demo.outer")
+	def outer():
+		with profiling.span("decode"):
+			pass
+		return inner()
+
+	assert outer() == _leaf()
+	# Nested profiled calls are folded into the outermost operation
+	names = sorted(p.suffix for p in tmp_path.iterdir())
+	assert names == [".collapsed", ".prof", ".txt"]
+	report = next(tmp_path.glob("*.txt")).read_text(encoding="utf-8")
+	assert "Operation: Demo.outer" in report
+	assert "network" in report and "decode" in report and "python" in report
+
+
+def test_disabled_is_passthrough(tmp_path, monkeypatch):
+	monkeypatch.setattr(profiling, "_output_dir", None)
+
+	@profiling.profiled("Demo.off")
+	def off():
+		with profiling.span("network"):
+			return 42
+
+	assert off() == 42
+	assert list(tmp_path.iterdir()) == []
+
+
+def test_overlapping_threads_share_tracing(tmp_path, monkeypatch):
+	monkeypatch.setattr(profiling, "_output_dir", None)
+	profiling.enable(str(tmp_path))
+	started = threading.Barrier(3)
+
+	@profiling.profiled("Demo.threaded")
+	def work(n):
+		started.wait(timeout=5)
+		# Stagger finishes so early callers release tracing while others still run
+		time.sleep(0.02 * n)
+		return n
+
+	results = {}
+	errors = []
+
+	def run(n):
+		try:
+			results[n] = work(n)
+		except Exception as exc:  # pragma: no cover - reported below
+			errors.append(exc)
+
+	threads = [threading.Thread(target=run, args=(n,)) for n in range(3)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	assert errors == []
+	assert results == {0: 0, 1: 1, 2: 2}
+	assert len(list(tmp_path.glob("*.txt"))) == 3
+	assert not tracemalloc.is_tracing()
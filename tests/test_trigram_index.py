@@ -0,0 +1,48 @@
+from utils.trigram_index import TrigramIndex, trigrams
+
+CATALOG = {
+	"re-classic": ("Royal Enfield Classic 350", "Royal Enfield"),
+	"re-meteor": ("Royal Enfield Meteor 350", "Royal Enfield"),
+	"ninja-300": ("Kawasaki Ninja 300", "Kawasaki"),
+	"ntorq": ("TVS Ntorq 125", "TVS"),
+	"pulsar": ("Bajaj Pulsar 150", "Bajaj"),
+}
+
+
+def _index():
+	return TrigramIndex.build(CATALOG.items())
+
+
+def _ids(results):
+	return [doc_id for doc_id, _ in results]
+
+
+def test_prefix_trigrams_leave_last_word_open():
+	assert "in " in trigrams("nin")
+	assert "in " not in trigrams("nin", prefix=True)
+
+
+def test_typo_still_matches():
+	assert set(_ids(_index().search("royal enfeld"))[:2]) == {"re-classic", "re-meteor"}
+	assert _ids(_index().search("pulsr")) == ["pulsar"]
+
+
+def test_prefix_match_ranks_first():
+	assert _ids(_index().search("nin"))[0] == "ninja-300"
+
+
+def test_limit_and_empty_query():
+	assert len(_index().search("royal", limit=1)) == 1
+	assert _index().search("  ") == []
+
+
+def test_add_and_remove_update_results():
+	index = _index()
+	index.remove("ninja-300")
+	assert "ninja-300" not in _ids(index.search("ninja"))
+	index.add("ninja-650", "Kawasaki Ninja 650", "Kawasaki")
+	assert _ids(index.search("ninja"))[0] == "ninja-650"
+	# Re-adding replaces the old text instead of merging with it
+	index.add("ninja-650", "Ather 450X", "Ather")
+	assert "ninja-650" not in _ids(index.search("ninja"))
+	assert len(index) == len(CATALOG)